@@ -4,45 +4,200 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
+import itertools
 import logging
+import math
 import socket
 import time
-import uuid
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, cast
+
+import orjson
 
 from shooter.config import (
+    BROADPHASE_THRESHOLD,
     BULLET_DAMAGE,
     BULLET_LIFETIME,
     BULLET_SPEED,
     NETWORK_CONFIG,
     PLAYER_RADIUS,
     RESPAWN_HEIGHT,
+    WORLD_EXTENT,
 )
+from shooter.network import FrameBuffer, encode_frame, encode_frame_parts
 
 logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s:%(name)s: %(message)s")
 LOGGER = logging.getLogger("dedicated_server")
 
+# Cells are at least as wide as the hit radius, so any player a bullet can hit
+# sits in the bullet's cell or one of its 26 neighbours.
+GRID_CELL_SIZE = 2 * PLAYER_RADIUS
+
+Cell = tuple[int, int, int]
+
+# Messages whose content never changes are framed once at import time.
+SERVER_FULL_FRAME = encode_frame({"type": "error", "message": "Server full"})
+DAMAGE_FRAME = encode_frame({"type": "damage", "amount": BULLET_DAMAGE})
 
-@dataclass
+
+@dataclass(slots=True)
 class PlayerState:
-    reader: asyncio.StreamReader
-    writer: asyncio.StreamWriter
+    id: int
+    writer: ShooterProtocol
     name: str
     position: list[float]
     rotation_y: float
     health: int = 100
-    last_update: float = field(default_factory=time.time)
+    last_update: float = field(default_factory=time.monotonic)
+    pending: list[bytes] = field(default_factory=list)
+    dirty: bool = True
+    snapshot: dict[str, Any] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.snapshot = {"id": self.id, "name": self.name}
+        self.sync_snapshot()
+
+    def sync_snapshot(self) -> None:
+        """Copy the mutable fields into the cached world_state entry.
 
+        The player is only marked for the next delta when something changed,
+        since clients report their state every tick even while idle.
+        """
 
-@dataclass
+        snapshot = self.snapshot
+        if (
+            snapshot.get("position") == self.position
+            and snapshot.get("rotation_y") == self.rotation_y
+            and snapshot.get("health") == self.health
+        ):
+            return
+        snapshot["position"] = self.position
+        snapshot["rotation_y"] = self.rotation_y
+        snapshot["health"] = self.health
+        self.dirty = True
+
+
+@dataclass(slots=True)
 class Bullet:
-    id: str
-    owner_id: str
+    id: int
+    owner_id: int
     position: list[float]
     direction: list[float]
     created_at: float
+    snapshot: dict[str, Any] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # ``position`` is advanced in place, so this entry never goes stale.
+        self.snapshot = {"id": self.id, "position": self.position, "direction": self.direction}
+
+
+class ShooterProtocol(asyncio.BufferedProtocol):
+    """Per-connection protocol that parses frames straight out of a reusable buffer."""
+
+    def __init__(self, server: ShooterServer) -> None:
+        self.server = server
+        self.player_id: Optional[int] = None
+        self._transport: Optional[asyncio.Transport] = None
+        self._frames = FrameBuffer()
+        self._paused = False
+        self._drain_waiter: Optional[asyncio.Future[None]] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = cast(asyncio.Transport, transport)
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        LOGGER.info("Client connected from %s", transport.get_extra_info("peername"))
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self._frames.writable()
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self._frames.advance(nbytes)
+        frames = self._frames.frames()
+        while True:
+            # Only framing errors drop the connection; bad payloads are skipped.
+            try:
+                body = next(frames, None)
+            except ValueError as exc:
+                LOGGER.warning("Dropping %s: %s", self._peername(), exc)
+                self.close()
+                return
+            if body is None:
+                return
+            try:
+                message = orjson.loads(body)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(message, dict):
+                self.server._handle_message(self, message)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if exc is not None:
+            LOGGER.warning("Connection reset by %s", self._peername())
+        self.server._handle_disconnect(self)
+        self._wake_drain(ConnectionResetError("Connection lost"))
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        self._wake_drain(None)
+
+    def write(self, data: bytes) -> None:
+        if self._transport is not None and not self._transport.is_closing():
+            self._transport.write(data)
+
+    def writelines(self, chunks: list[bytes]) -> None:
+        if self._transport is not None and not self._transport.is_closing():
+            self._transport.writelines(chunks)
+
+    async def drain(self) -> None:
+        if self._transport is None or self._transport.is_closing():
+            raise ConnectionResetError("Connection lost")
+        if not self._paused:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._drain_waiter = waiter
+        await waiter
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    def abort(self) -> None:
+        """Close immediately, discarding buffered output a stalled peer will never read."""
+
+        if self._transport is not None:
+            self._transport.abort()
+
+    def _peername(self) -> Any:
+        return self._transport.get_extra_info("peername") if self._transport else None
+
+    def _wake_drain(self, exc: Optional[Exception]) -> None:
+        waiter, self._drain_waiter = self._drain_waiter, None
+        if waiter is None or waiter.done():
+            return
+        if exc is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(exc)
+
+
+class DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Answers LAN discovery probes directly on the event loop."""
+
+    def __init__(self, server: ShooterServer) -> None:
+        self.server = server
+        self._transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = cast(asyncio.DatagramTransport, transport)
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        if self._transport is not None and data.strip() == b"DISCOVER":
+            self._transport.sendto(self.server._discovery_response, addr)
 
 
 class ShooterServer:
@@ -51,163 +206,317 @@ class ShooterServer:
         self.port = port
         self.name = name
         self.max_players = max_players
-        self.players: Dict[str, PlayerState] = {}
-        self.bullets: Dict[str, Bullet] = {}
-        self._server: Optional[asyncio.base_events.Server] = None
-        self._discovery_socket: Optional[socket.socket] = None
+        self.players: Dict[int, PlayerState] = {}
+        self.bullets: Dict[int, Bullet] = {}
+        self._next_player_id = itertools.count(1)
+        self._next_bullet_id = itertools.count(1)
+        self._drain_timeout = 1.0 / NETWORK_CONFIG.tick_rate
+        self._ticks_per_keyframe = max(1, NETWORK_CONFIG.tick_rate // NETWORK_CONFIG.keyframe_rate)
+        self._ticks_until_keyframe = 0
+        self._left_players: list[int] = []
+        self._spawned_bullets: list[int] = []
+        self._removed_bullets: list[int] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._discovery_transport: Optional[asyncio.DatagramTransport] = None
+        self._discovery_response = b""
+        self._refresh_discovery_response()
         self._running = False
 
     async def start(self) -> None:
-        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(lambda: ShooterProtocol(self), self.host, self.port)
         LOGGER.info("Server started on %s:%s", self.host, self.port)
         self._running = True
         asyncio.create_task(self._world_tick())
-        asyncio.create_task(self._discovery_loop())
+        await self._start_discovery()
 
     async def stop(self) -> None:
         self._running = False
         if self._server:
             self._server.close()
             await self._server.wait_closed()
-        if self._discovery_socket:
-            self._discovery_socket.close()
+        if self._discovery_transport:
+            self._discovery_transport.close()
 
-    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
-        addr = writer.get_extra_info("peername")
-        player_id: Optional[str] = None
-        LOGGER.info("Client connected from %s", addr)
-        try:
-            while data := await reader.readline():
-                try:
-                    message = json.loads(data.decode("utf8"))
-                except json.JSONDecodeError:
-                    continue
-                msg_type = message.get("type")
-                if msg_type == "join":
-                    if len(self.players) >= self.max_players:
-                        writer.write((json.dumps({"type": "error", "message": "Server full"}) + "\n").encode("utf8"))
-                        await writer.drain()
-                        break
-                    player_id = uuid.uuid4().hex
-                    name = message.get("name", "Player")
-                    state = PlayerState(
-                        reader=reader,
-                        writer=writer,
-                        name=name,
-                        position=[0.0, RESPAWN_HEIGHT, 0.0],
-                        rotation_y=0.0,
-                    )
-                    self.players[player_id] = state
-                    LOGGER.info("Player %s joined as %s", player_id, name)
-                    writer.write((json.dumps({"type": "welcome", "player_id": player_id}) + "\n").encode("utf8"))
-                    await writer.drain()
-                elif msg_type == "state" and player_id:
-                    state = self.players.get(player_id)
-                    if not state:
-                        continue
-                    state.position = message.get("position", state.position)
-                    state.rotation_y = message.get("rotation_y", state.rotation_y)
-                    state.health = message.get("health", state.health)
-                    state.last_update = time.time()
-                elif msg_type == "shoot" and player_id:
-                    origin = message.get("origin")
-                    direction = message.get("direction")
-                    if origin and direction:
-                        bullet_id = uuid.uuid4().hex
-                        self.bullets[bullet_id] = Bullet(
-                            id=bullet_id,
-                            owner_id=player_id,
-                            position=list(origin),
-                            direction=list(direction),
-                            created_at=time.time(),
-                        )
-        except ConnectionResetError:
-            LOGGER.warning("Connection reset by %s", addr)
-        finally:
-            if player_id and player_id in self.players:
-                LOGGER.info("Player %s disconnected", player_id)
-                del self.players[player_id]
-            writer.close()
-            await writer.wait_closed()
+    def _handle_message(self, conn: ShooterProtocol, message: dict[str, Any]) -> None:
+        msg_type = message.get("type")
+        player_id = conn.player_id
+        if msg_type == "join":
+            if len(self.players) >= self.max_players:
+                conn.write(SERVER_FULL_FRAME)
+                conn.close()
+                return
+            player_id = next(self._next_player_id)
+            name = str(message.get("name", "Player"))
+            state = PlayerState(
+                id=player_id,
+                writer=conn,
+                name=name,
+                position=[0.0, RESPAWN_HEIGHT, 0.0],
+                rotation_y=0.0,
+            )
+            self.players[player_id] = state
+            conn.player_id = player_id
+            self._refresh_discovery_response()
+            # Newcomers need a full snapshot before deltas make sense.
+            self._ticks_until_keyframe = 0
+            LOGGER.info("Player %s joined as %s", player_id, name)
+            conn.write(encode_frame({"type": "welcome", "player_id": player_id}))
+        elif msg_type == "state" and player_id is not None:
+            state = self.players.get(player_id)
+            if not state:
+                return
+            state.position = _vec3(message.get("position")) or state.position
+            rotation_y = _float(message.get("rotation_y"))
+            if rotation_y is not None:
+                state.rotation_y = rotation_y
+            health = _int(message.get("health"))
+            if health is not None:
+                # Clamp so a bogus value cannot exceed what orjson can encode.
+                state.health = max(0, min(100, health))
+            state.last_update = time.monotonic()
+            state.sync_snapshot()
+        elif msg_type == "shoot" and player_id is not None:
+            origin = _vec3(message.get("origin"))
+            direction = _unit(_vec3(message.get("direction")))
+            if origin and direction and _in_world(origin):
+                bullet_id = next(self._next_bullet_id)
+                self.bullets[bullet_id] = Bullet(
+                    id=bullet_id,
+                    owner_id=player_id,
+                    position=origin,
+                    direction=direction,
+                    created_at=time.monotonic(),
+                )
+                self._spawned_bullets.append(bullet_id)
+
+    def _handle_disconnect(self, conn: ShooterProtocol) -> None:
+        player_id = conn.player_id
+        if player_id is not None and player_id in self.players:
+            LOGGER.info("Player %s disconnected", player_id)
+            del self.players[player_id]
+            self._left_players.append(player_id)
+            self._refresh_discovery_response()
 
     async def _world_tick(self) -> None:
         tick_interval = 1.0 / NETWORK_CONFIG.tick_rate
         while self._running:
-            start = time.time()
-            await self._update_bullets(tick_interval)
-            await self._broadcast_state()
-            elapsed = time.time() - start
+            now = time.monotonic()
+            self._update_bullets(tick_interval, now)
+            self._broadcast_state()
+            await self._flush_writes()
+            elapsed = time.monotonic() - now
             await asyncio.sleep(max(0.0, tick_interval - elapsed))
 
-    async def _update_bullets(self, dt: float) -> None:
-        to_remove = []
-        for bullet_id, bullet in list(self.bullets.items()):
-            bullet.position[0] += bullet.direction[0] * BULLET_SPEED * dt
-            bullet.position[1] += bullet.direction[1] * BULLET_SPEED * dt
-            bullet.position[2] += bullet.direction[2] * BULLET_SPEED * dt
-            if time.time() - bullet.created_at > BULLET_LIFETIME:
-                to_remove.append(bullet_id)
-                continue
-            for pid, player in self.players.items():
-                if pid == bullet.owner_id:
-                    continue
-                if _distance_sq(bullet.position, player.position) <= PLAYER_RADIUS ** 2:
-                    player.health -= BULLET_DAMAGE
-                    LOGGER.info("Player %s hit for %s", pid, BULLET_DAMAGE)
-                    await self._send_message(player.writer, {"type": "damage", "amount": BULLET_DAMAGE})
-                    if player.health <= 0:
-                        player.position = [0.0, RESPAWN_HEIGHT, 0.0]
-                        player.health = 100
-                    to_remove.append(bullet_id)
-                    break
-        for bullet_id in to_remove:
-            self.bullets.pop(bullet_id, None)
-
-    async def _broadcast_state(self) -> None:
-        payload = {
-            "type": "world_state",
-            "players": [
-                {
-                    "id": pid,
-                    "name": player.name,
-                    "position": player.position,
-                    "rotation_y": player.rotation_y,
-                    "health": player.health,
+    def _update_bullets(self, dt: float, now: float) -> None:
+        hits, expired = _tick_bullets(self.bullets, self.players, dt, now)
+        for bullet_id, pid in hits:
+            player = self.players[pid]
+            player.health -= BULLET_DAMAGE
+            LOGGER.info("Player %s hit for %s", pid, BULLET_DAMAGE)
+            player.pending.append(DAMAGE_FRAME)
+            if player.health <= 0:
+                player.position = [0.0, RESPAWN_HEIGHT, 0.0]
+                player.health = 100
+            player.sync_snapshot()
+            del self.bullets[bullet_id]
+            self._removed_bullets.append(bullet_id)
+        for bullet_id in expired:
+            del self.bullets[bullet_id]
+        self._removed_bullets.extend(expired)
+
+    def _broadcast_state(self) -> None:
+        """Queue a world_state keyframe or, between keyframes, a world_delta.
+
+        Deltas carry the players whose state changed plus bullet spawns and
+        removals; clients extrapolate bullets from their direction meanwhile.
+        """
+
+        payload: Optional[dict[str, Any]]
+        if self._ticks_until_keyframe <= 0:
+            self._ticks_until_keyframe = self._ticks_per_keyframe
+            payload = {
+                "type": "world_state",
+                "players": [player.snapshot for player in self.players.values()],
+                "projectiles": [bullet.snapshot for bullet in self.bullets.values()],
+            }
+        else:
+            players = [player.snapshot for player in self.players.values() if player.dirty]
+            spawned = [
+                self.bullets[bullet_id].snapshot for bullet_id in self._spawned_bullets if bullet_id in self.bullets
+            ]
+            if players or spawned or self._left_players or self._removed_bullets:
+                payload = {
+                    "type": "world_delta",
+                    "players": players,
+                    "left": self._left_players,
+                    "spawned": spawned,
+                    "expired": self._removed_bullets,
                 }
-                for pid, player in self.players.items()
-            ],
-            "projectiles": [
-                {"id": bullet.id, "position": bullet.position} for bullet in self.bullets.values()
-            ],
-        }
-        message = (json.dumps(payload) + "\n").encode("utf8")
-        for player in list(self.players.values()):
-            try:
-                player.writer.write(message)
-                await player.writer.drain()
-            except ConnectionResetError:
+            else:
+                payload = None
+        self._ticks_until_keyframe -= 1
+        # Every client queues the same header and body objects; nothing is copied per recipient.
+        frame = encode_frame_parts(payload) if payload is not None else ()
+        for player in self.players.values():
+            player.pending.extend(frame)
+            player.dirty = False
+        self._left_players.clear()
+        self._spawned_bullets.clear()
+        self._removed_bullets.clear()
+
+    async def _flush_writes(self) -> None:
+        """Hand each player's queued chunks to one writelines call and drain all clients together.
+
+        A client whose buffer does not drain within one tick is dropped, so a
+        peer that stops reading cannot stall the simulation for everyone.
+        """
+
+        writers: list[ShooterProtocol] = []
+        for player in self.players.values():
+            if not player.pending:
                 continue
+            player.writer.writelines(player.pending)
+            player.pending = []
+            writers.append(player.writer)
+        await asyncio.gather(*(self._drain(writer) for writer in writers))
 
-    async def _send_message(self, writer: asyncio.StreamWriter, payload: dict) -> None:
-        writer.write((json.dumps(payload) + "\n").encode("utf8"))
-        await writer.drain()
+    async def _drain(self, writer: ShooterProtocol) -> None:
+        try:
+            await asyncio.wait_for(writer.drain(), self._drain_timeout)
+        except asyncio.TimeoutError:
+            LOGGER.warning("Dropping player %s: not reading fast enough", writer.player_id)
+            writer.abort()
+        except ConnectionError:
+            # The peer went away; connection_lost removes the player.
+            pass
 
-    async def _discovery_loop(self) -> None:
+    async def _start_discovery(self) -> None:
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.bind(("", NETWORK_CONFIG.discovery_port))
-        self._discovery_socket = sock
-        LOGGER.info("Discovery service listening on %s", NETWORK_CONFIG.discovery_port)
         loop = asyncio.get_running_loop()
-        while self._running:
-            data, addr = await loop.run_in_executor(None, sock.recvfrom, 512)
-            if data.strip() == b"DISCOVER":
-                response = f"SERVER {self.name} {self.port} {len(self.players)} {self.max_players}\n"
-                sock.sendto(response.encode("utf8"), addr)
+        self._discovery_transport, _ = await loop.create_datagram_endpoint(lambda: DiscoveryProtocol(self), sock=sock)
+        LOGGER.info("Discovery service listening on %s", NETWORK_CONFIG.discovery_port)
+
+    def _refresh_discovery_response(self) -> None:
+        """Rebuild the cached probe reply; only the player count ever changes."""
+
+        response = f"SERVER {self.name} {self.port} {len(self.players)} {self.max_players}\n"
+        self._discovery_response = response.encode("utf8")
+
+
+def _tick_bullets(
+    bullets: Dict[int, Bullet], players: Dict[int, PlayerState], dt: float, now: float
+) -> tuple[list[tuple[int, int]], list[int]]:
+    """Advance every bullet by ``dt`` and test it against the players.
+
+    Returns ``(hits, expired)``: ``(bullet_id, player_id)`` pairs for bullets
+    that struck a player this tick and the ids of bullets past their lifetime
+    or outside ``WORLD_EXTENT``.
+    Nothing is mutated apart from bullet positions.
+    """
+
+    step = BULLET_SPEED * dt
+    radius_sq = PLAYER_RADIUS * PLAYER_RADIUS
+    targets = players.items()
+    grid = _build_grid(targets) if len(players) + len(bullets) > BROADPHASE_THRESHOLD else None
+    hits: list[tuple[int, int]] = []
+    expired: list[int] = []
+    for bullet_id, bullet in bullets.items():
+        position = bullet.position
+        direction = bullet.direction
+        position[0] += direction[0] * step
+        position[1] += direction[1] * step
+        position[2] += direction[2] * step
+        # Bullets leaving the world expire before grid bucketing, which needs finite cells.
+        if now - bullet.created_at > BULLET_LIFETIME or not _in_world(position):
+            expired.append(bullet_id)
+            continue
+        owner_id = bullet.owner_id
+        candidates = targets if grid is None else _nearby(grid, position)
+        for pid, player in candidates:
+            if pid != owner_id and _distance_sq(position, player.position) <= radius_sq:
+                hits.append((bullet_id, pid))
+                break
+    return hits, expired
+
+
+def _vec3(value: Any) -> Optional[list[float]]:
+    """Coerce a decoded ``[x, y, z]`` array to finite floats, or ``None`` if malformed."""
+
+    try:
+        x, y, z = value
+        vector = [float(x), float(y), float(z)]
+    except (TypeError, ValueError):
+        return None
+    return vector if all(math.isfinite(component) for component in vector) else None
+
+
+def _unit(vector: Optional[list[float]]) -> Optional[list[float]]:
+    """Scale ``vector`` to unit length, or return ``None`` if it has no length."""
+
+    if vector is None:
+        return None
+    length = math.hypot(*vector)
+    if not length or not math.isfinite(length):
+        return None
+    return [vector[0] / length, vector[1] / length, vector[2] / length]
+
+
+def _in_world(position: list[float]) -> bool:
+    return all(-WORLD_EXTENT <= component <= WORLD_EXTENT for component in position)
+
+
+def _float(value: Any) -> Optional[float]:
+    """Coerce a decoded scalar to a finite float, or ``None`` if missing or malformed."""
+
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _int(value: Any) -> Optional[int]:
+    """Coerce a decoded scalar to an int, or ``None`` if missing or malformed."""
+
+    try:
+        return int(value)
+    except (OverflowError, TypeError, ValueError):
+        return None
+
+
+def _cell(position: list[float]) -> Cell:
+    return (
+        int(position[0] // GRID_CELL_SIZE),
+        int(position[1] // GRID_CELL_SIZE),
+        int(position[2] // GRID_CELL_SIZE),
+    )
+
+
+def _build_grid(targets: Iterable[tuple[int, PlayerState]]) -> Dict[Cell, list[tuple[int, PlayerState]]]:
+    grid: Dict[Cell, list[tuple[int, PlayerState]]] = {}
+    for pid, player in targets:
+        grid.setdefault(_cell(player.position), []).append((pid, player))
+    return grid
+
+
+def _nearby(
+    grid: Dict[Cell, list[tuple[int, PlayerState]]], position: list[float]
+) -> Iterator[tuple[int, PlayerState]]:
+    cx, cy, cz = _cell(position)
+    for x in (cx - 1, cx, cx + 1):
+        for y in (cy - 1, cy, cy + 1):
+            for z in (cz - 1, cz, cz + 1):
+                yield from grid.get((x, y, z), ())
 
 
 def _distance_sq(a: list[float], b: list[float]) -> float:
-    return sum((x - y) ** 2 for x, y in zip(a, b))
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
 
 
 def parse_args() -> argparse.Namespace:
@@ -231,7 +540,19 @@ async def _async_main() -> None:
         await server.stop()
 
 
+def _install_event_loop_policy() -> None:
+    """Run on uvloop when it is installed, otherwise keep the default loop."""
+
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    LOGGER.info("Using uvloop event loop")
+
+
 def main() -> None:  # pragma: no cover - CLI entry
+    _install_event_loop_policy()
     asyncio.run(_async_main())
 
 
@@ -14,6 +14,8 @@ class NetworkConfig:
     game_port: int = int(os.environ.get("SHOOTER_GAME_PORT", 50000))
     discovery_port: int = int(os.environ.get("SHOOTER_DISCOVERY_PORT", 50001))
     tick_rate: int = 30
+    # Full world_state snapshots per second; other ticks only send world_delta.
+    keyframe_rate: int = 1
     max_players: int = 8
 
 
@@ -25,4 +27,8 @@ BULLET_SPEED = 18.0
 BULLET_LIFETIME = 3.0
 BULLET_DAMAGE = 25
 RESPAWN_HEIGHT = 3.0
+# Half-width of the cube around the origin that shots and bullets must stay in.
+WORLD_EXTENT = 1000.0
+# Entity count (players + bullets) above which hit tests use a spatial grid.
+BROADPHASE_THRESHOLD = 32
 
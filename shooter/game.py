@@ -20,7 +20,7 @@ from ursina import (
     camera,
 )
 
-from .config import NETWORK_CONFIG, RESPAWN_HEIGHT
+from .config import BULLET_SPEED, NETWORK_CONFIG, RESPAWN_HEIGHT
 from .network import NetworkClient
 
 
@@ -36,24 +36,41 @@ class ProjectilePool:
     """Manages projectile entities to reduce allocations."""
 
     def __init__(self) -> None:
-        self._pool: Dict[str, Entity] = {}
+        self._pool: Dict[int, Entity] = {}
+        self._velocities: Dict[int, Vec3] = {}
 
-    def update_projectiles(self, projectiles: Dict[str, Dict[str, float]]) -> None:
+    def update_projectiles(self, projectiles: Dict[int, dict]) -> None:
         seen = set(projectiles.keys())
         # Update existing projectiles or create new ones
-        for bullet_id, data in projectiles.items():
-            entity = self._pool.get(bullet_id)
-            if entity is None:
-                entity = Entity(model="sphere", scale=0.2, color=Color.yellow)
-                self._pool[bullet_id] = entity
-            else:
-                entity.enable()
-            entity.position = Vec3(*data["position"])
+        for data in projectiles.values():
+            self.spawn(data)
         # Remove expired projectiles
         to_remove = [bullet_id for bullet_id in self._pool if bullet_id not in seen]
         for bullet_id in to_remove:
-            self._pool[bullet_id].disable()
-            del self._pool[bullet_id]
+            self.remove(bullet_id)
+
+    def spawn(self, data: dict) -> None:
+        bullet_id = data["id"]
+        entity = self._pool.get(bullet_id)
+        if entity is None:
+            entity = Entity(model="sphere", scale=0.2, color=Color.yellow)
+            self._pool[bullet_id] = entity
+        else:
+            entity.enable()
+        entity.position = Vec3(*data["position"])
+        self._velocities[bullet_id] = Vec3(*data.get("direction", (0, 0, 0))) * BULLET_SPEED
+
+    def remove(self, bullet_id: int) -> None:
+        entity = self._pool.pop(bullet_id, None)
+        if entity is not None:
+            entity.disable()
+        self._velocities.pop(bullet_id, None)
+
+    def advance(self, dt: float) -> None:
+        """Extrapolate projectiles between server keyframes."""
+
+        for bullet_id, entity in self._pool.items():
+            entity.position += self._velocities[bullet_id] * dt
 
 
 class ShooterGame:
@@ -64,10 +81,11 @@ class ShooterGame:
         self.client = client
         self.player_name = player_name
         self.player: Optional[FirstPersonController] = None
-        self.remote_players: Dict[str, RemotePlayer] = {}
+        self.remote_players: Dict[int, RemotePlayer] = {}
         self.projectiles = ProjectilePool()
         self.health = 100
         self.last_state_sent = time.time()
+        self.last_update = self.last_state_sent
         self.state_interval = 1.0 / NETWORK_CONFIG.tick_rate
         self._setup_scene()
 
@@ -113,6 +131,8 @@ class ShooterGame:
         now = time.time()
         for message in self.client.poll():
             self._handle_message(message)
+        self.projectiles.advance(now - self.last_update)
+        self.last_update = now
 
         if now - self.last_state_sent >= self.state_interval:
             self._send_state()
@@ -163,6 +183,8 @@ class ShooterGame:
         msg_type = message.get("type")
         if msg_type == "world_state":
             self._update_world(message)
+        elif msg_type == "world_delta":
+            self._apply_world_delta(message)
         elif msg_type == "damage":
             amount = message.get("amount", 0)
             self.health = max(0, self.health - amount)
@@ -177,41 +199,65 @@ class ShooterGame:
 
     # ------------------------------------------------------------------
     def _update_world(self, message: dict) -> None:
-        players = message.get("players", [])
         assert self.player is not None
-        my_id = self.client.player_id
+        players = message.get("players", [])
         for player_data in players:
-            player_id = player_data["id"]
-            if player_id == my_id:
-                continue
-            remote = self.remote_players.get(player_id)
-            if remote is None:
-                entity = Entity(model="cube", color=Color.azure, scale_y=2, origin_y=-0.5)
-                entity.collider = "box"
-                name_tag = Text(text=player_data["name"], world_parent=entity, position=(0, 1.6, 0))
-                health_bar = Entity(parent=entity, model="cube", color=Color.red, scale=(0.5, 0.05, 0.05), position=(0, 1.4, 0))
-                remote = RemotePlayer(entity=entity, name_tag=name_tag, health_bar=health_bar)
-                self.remote_players[player_id] = remote
-            entity = remote.entity
-            entity.position = Vec3(*player_data["position"])
-            entity.rotation_y = player_data.get("rotation_y", 0)
-            health = player_data.get("health", 100)
-            remote.health_bar.scale_x = max(0.1, health / 100 * 0.5)
-            remote.last_seen = time.time()
+            self._update_remote_player(player_data)
+
+        # Keyframes list every connected player, so anyone missing has left.
+        present_ids = {player_data["id"] for player_data in players}
+        departed_ids = [player_id for player_id in self.remote_players if player_id not in present_ids]
+        for player_id in departed_ids:
+            self._remove_remote_player(player_id)
 
         # Remove stale players
         stale_ids = [player_id for player_id, remote in self.remote_players.items() if time.time() - remote.last_seen > 5]
         for player_id in stale_ids:
-            remote = self.remote_players[player_id]
-            remote.entity.disable()
-            remote.name_tag.disable()
-            del self.remote_players[player_id]
+            self._remove_remote_player(player_id)
 
         projectile_data = {
             proj["id"]: proj for proj in message.get("projectiles", [])
         }
         self.projectiles.update_projectiles(projectile_data)
 
+    # ------------------------------------------------------------------
+    def _apply_world_delta(self, message: dict) -> None:
+        for player_data in message.get("players", []):
+            self._update_remote_player(player_data)
+        for player_id in message.get("left", []):
+            self._remove_remote_player(player_id)
+        for projectile in message.get("spawned", []):
+            self.projectiles.spawn(projectile)
+        for bullet_id in message.get("expired", []):
+            self.projectiles.remove(bullet_id)
+
+    # ------------------------------------------------------------------
+    def _update_remote_player(self, player_data: dict) -> None:
+        player_id = player_data["id"]
+        if player_id == self.client.player_id:
+            return
+        remote = self.remote_players.get(player_id)
+        if remote is None:
+            entity = Entity(model="cube", color=Color.azure, scale_y=2, origin_y=-0.5)
+            entity.collider = "box"
+            name_tag = Text(text=player_data["name"], world_parent=entity, position=(0, 1.6, 0))
+            health_bar = Entity(parent=entity, model="cube", color=Color.red, scale=(0.5, 0.05, 0.05), position=(0, 1.4, 0))
+            remote = RemotePlayer(entity=entity, name_tag=name_tag, health_bar=health_bar)
+            self.remote_players[player_id] = remote
+        entity = remote.entity
+        entity.position = Vec3(*player_data["position"])
+        entity.rotation_y = player_data.get("rotation_y", 0)
+        health = player_data.get("health", 100)
+        remote.health_bar.scale_x = max(0.1, health / 100 * 0.5)
+        remote.last_seen = time.time()
+
+    # ------------------------------------------------------------------
+    def _remove_remote_player(self, player_id: int) -> None:
+        remote = self.remote_players.pop(player_id, None)
+        if remote is not None:
+            remote.entity.disable()
+            remote.name_tag.disable()
+
 
 def build_game(app: Ursina, client: NetworkClient, player_name: str) -> ShooterGame:
     return ShooterGame(app, client, player_name)
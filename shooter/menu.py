@@ -90,6 +90,7 @@ class MainMenu:
         self.on_start_game(server_info, name)
 
     def hide(self) -> None:
+        self.discovery.close()
         for entry in self._active_entries:
             entry.disable()
         self.name_field.disable()
@@ -2,17 +2,93 @@
 
 from __future__ import annotations
 
-import json
-import queue
+import collections
+import select
 import socket
+import struct
 import threading
 import time
 import uuid
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import orjson
 
 from .config import NETWORK_CONFIG
 
+FRAME_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 1 << 20
+RECV_BUFFER_SIZE = 64 * 1024
+
+
+def encode_frame_parts(payload: dict) -> tuple[bytes, bytes]:
+    """Serialize ``payload`` and return its ``(header, body)`` without joining them."""
+
+    body = orjson.dumps(payload)
+    return FRAME_HEADER.pack(len(body)), body
+
+
+def encode_frame(payload: dict) -> bytes:
+    """Serialize ``payload`` as JSON prefixed with its 4-byte big-endian length."""
+
+    header, body = encode_frame_parts(payload)
+    return header + body
+
+
+class FrameBuffer:
+    """Reusable receive buffer that splits length-prefixed frames in place."""
+
+    def __init__(self, size: int = RECV_BUFFER_SIZE) -> None:
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+    def writable(self) -> memoryview:
+        """Return the free tail of the buffer to receive into."""
+
+        return self._view[self._end :]
+
+    def advance(self, nbytes: int) -> None:
+        """Mark ``nbytes`` freshly received bytes as readable."""
+
+        self._end += nbytes
+
+    def frames(self) -> Iterator[memoryview]:
+        """Yield the body of every complete frame received so far.
+
+        The yielded views alias the internal buffer and are only valid until
+        the next call to :meth:`writable`.
+        """
+
+        needed = FRAME_HEADER.size
+        while self._end - self._start >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(self._buffer, self._start)
+            if length > MAX_FRAME_SIZE:
+                raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+            body_start = self._start + FRAME_HEADER.size
+            body_end = body_start + length
+            if body_end > self._end:
+                needed = FRAME_HEADER.size + length
+                break
+            self._start = body_end
+            yield self._view[body_start:body_end]
+        self._compact(needed)
+
+    def _compact(self, needed: int) -> None:
+        pending = self._end - self._start
+        if not pending:
+            self._start = self._end = 0
+            return
+        if self._start:
+            self._buffer[:pending] = self._buffer[self._start : self._end]
+            self._start, self._end = 0, pending
+        if needed > len(self._buffer):
+            grown = bytearray(needed)
+            grown[:pending] = self._view[:pending]
+            self._buffer = grown
+            self._view = memoryview(grown)
+
 
 @dataclass
 class ServerInfo:
@@ -28,54 +104,74 @@ class ServerInfo:
 class DiscoveryClient:
     """Discovers LAN servers via UDP broadcast."""
 
-    def __init__(self, timeout: float = 1.5) -> None:
+    def __init__(self, timeout: float = 1.5, quiet_period: float = 0.25) -> None:
         self.timeout = timeout
+        # Once a server has answered, stop after this long without further replies.
+        self.quiet_period = quiet_period
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        self._sock.setblocking(False)
 
     def scan(self) -> List[ServerInfo]:
         message = b"DISCOVER\n"
         servers: Dict[str, ServerInfo] = {}
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        sock.settimeout(self.timeout)
-        try:
-            sock.sendto(message, ("<broadcast>", NETWORK_CONFIG.discovery_port))
-            start = time.time()
-            while time.time() - start < self.timeout:
-                try:
-                    data, addr = sock.recvfrom(1024)
-                except socket.timeout:
-                    break
-                parts = data.decode("utf8").strip().split()
-                if len(parts) != 5 or parts[0] != "SERVER":
-                    continue
-                _, name, port, players, max_players = parts
-                servers[addr[0]] = ServerInfo(
-                    name=name,
-                    host=addr[0],
-                    port=int(port),
-                    players=int(players),
-                    max_players=int(max_players),
-                )
-        finally:
-            sock.close()
+        sock = self._sock
+        self._discard_pending()
+        sock.sendto(message, ("<broadcast>", NETWORK_CONFIG.discovery_port))
+        deadline = time.monotonic() + self.timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            wait = min(remaining, self.quiet_period) if servers else remaining
+            ready, _, _ = select.select([sock], [], [], wait)
+            if not ready:
+                break
+            try:
+                data, addr = sock.recvfrom(1024)
+            except OSError:
+                continue
+            parts = data.decode("utf8").strip().split()
+            if len(parts) != 5 or parts[0] != "SERVER":
+                continue
+            _, name, port, players, max_players = parts
+            servers[addr[0]] = ServerInfo(
+                name=name,
+                host=addr[0],
+                port=int(port),
+                players=int(players),
+                max_players=int(max_players),
+            )
         return list(servers.values())
 
+    def close(self) -> None:
+        self._sock.close()
+
+    def _discard_pending(self) -> None:
+        """Drop late replies to a previous scan so they are not counted twice."""
+
+        while True:
+            try:
+                self._sock.recvfrom(1024)
+            except OSError:
+                return
+
 
 class NetworkClient:
-    """Thread-based TCP client that communicates using JSON lines."""
+    """Thread-based TCP client that exchanges length-prefixed JSON frames."""
 
     def __init__(self) -> None:
         self._socket: Optional[socket.socket] = None
         self._receiver: Optional[threading.Thread] = None
-        self._messages: "queue.Queue[dict]" = queue.Queue()
+        # Single producer (receiver thread) and single consumer (game loop):
+        # deque.append/popleft are atomic, so no lock is needed.
+        self._messages: collections.deque[dict] = collections.deque()
         self._running = threading.Event()
         self._running.clear()
-        self.player_id: Optional[str] = None
+        self.player_id: Optional[int] = None
 
     def connect(self, host: str, port: int, name: str) -> None:
         if self._socket:
             raise RuntimeError("Client already connected")
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         sock.connect((host, port))
         self._socket = sock
         self._running.set()
@@ -95,33 +191,33 @@ class NetworkClient:
 
     def _receive_loop(self) -> None:
         assert self._socket is not None
-        buffer = b""
         sock = self._socket
+        frames = FrameBuffer()
         while self._running.is_set():
             try:
-                chunk = sock.recv(4096)
+                count = sock.recv_into(frames.writable())
             except OSError:
                 break
-            if not chunk:
+            if not count:
+                break
+            frames.advance(count)
+            try:
+                for body in frames.frames():
+                    try:
+                        message = orjson.loads(body)
+                    except orjson.JSONDecodeError:
+                        continue
+                    if message.get("type") == "welcome":
+                        self.player_id = message.get("player_id")
+                    self._messages.append(message)
+            except ValueError:
                 break
-            buffer += chunk
-            while b"\n" in buffer:
-                raw, buffer = buffer.split(b"\n", 1)
-                if not raw:
-                    continue
-                try:
-                    message = json.loads(raw.decode("utf8"))
-                except json.JSONDecodeError:
-                    continue
-                if message.get("type") == "welcome":
-                    self.player_id = message.get("player_id")
-                self._messages.put(message)
         self._running.clear()
 
     def send(self, payload: dict) -> None:
         if not self._socket:
             raise RuntimeError("Not connected")
-        data = (json.dumps(payload) + "\n").encode("utf8")
+        data = encode_frame(payload)
         try:
             self._socket.sendall(data)
         except OSError as exc:
@@ -130,11 +226,9 @@ class NetworkClient:
     def poll(self) -> Iterable[dict]:
         """Yield all pending messages."""
 
-        while True:
-            try:
-                yield self._messages.get_nowait()
-            except queue.Empty:
-                break
+        messages = self._messages
+        while messages:
+            yield messages.popleft()
 
 
 def generate_player_id() -> str:
@@ -0,0 +1,75 @@
+"""Tests for the length-prefixed frame buffer shared by client and server."""
+
+from __future__ import annotations
+
+import unittest
+
+from shooter.network import FRAME_HEADER, MAX_FRAME_SIZE, FrameBuffer
+
+
+def frame(body: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def feed(buffer: FrameBuffer, data: bytes) -> list[bytes]:
+    """Copy ``data`` into the buffer as one read and return the completed frames."""
+
+    view = buffer.writable()
+    assert len(data) <= len(view), "read larger than the free space offered"
+    view[: len(data)] = data
+    buffer.advance(len(data))
+    return [bytes(body) for body in buffer.frames()]
+
+
+class FrameBufferTest(unittest.TestCase):
+    def test_frame_split_across_reads(self) -> None:
+        buffer = FrameBuffer(64)
+        data = frame(b"hello world")
+
+        self.assertEqual(feed(buffer, data[:2]), [])
+        self.assertEqual(feed(buffer, data[2:7]), [])
+        self.assertEqual(feed(buffer, data[7:]), [b"hello world"])
+
+    def test_several_frames_in_one_read(self) -> None:
+        buffer = FrameBuffer(64)
+
+        frames = feed(buffer, frame(b"one") + frame(b"") + frame(b"three"))
+        self.assertEqual(frames, [b"one", b"", b"three"])
+        self.assertEqual(len(buffer.writable()), 64)
+
+    def test_grows_for_frame_larger_than_buffer(self) -> None:
+        buffer = FrameBuffer(16)
+        body = bytes(range(100))
+        data = frame(body)
+
+        received: list[bytes] = []
+        while data:
+            chunk_size = len(buffer.writable())
+            received += feed(buffer, data[:chunk_size])
+            data = data[chunk_size:]
+        self.assertEqual(received, [body])
+
+    def test_compacts_leftover_partial_frame(self) -> None:
+        buffer = FrameBuffer(32)
+        first, second = frame(b"a" * 20), frame(b"b" * 10)
+
+        # Fill the buffer completely: one whole frame plus the start of the next.
+        data = first + second
+        leftover = 32 - len(first)
+        self.assertEqual(feed(buffer, data[:32]), [b"a" * 20])
+        # The partial frame was moved to the front, freeing the tail for the rest.
+        self.assertEqual(len(buffer.writable()), 32 - leftover)
+        self.assertEqual(feed(buffer, data[32:]), [b"b" * 10])
+        self.assertEqual(len(buffer.writable()), 32)
+
+    def test_rejects_oversized_frame(self) -> None:
+        buffer = FrameBuffer(16)
+        buffer.writable()[: FRAME_HEADER.size] = FRAME_HEADER.pack(MAX_FRAME_SIZE + 1)
+        buffer.advance(FRAME_HEADER.size)
+
+        with self.assertRaises(ValueError):
+            list(buffer.frames())
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    unittest.main()
@@ -3,19 +3,26 @@
 from __future__ import annotations
 
 import asyncio
-from time import time
+from time import monotonic
 import unittest
 
+import orjson
+
 from server.dedicated_server import Bullet, PlayerState, ShooterServer
+from shooter.config import BROADPHASE_THRESHOLD, BULLET_DAMAGE, RESPAWN_HEIGHT
 
 
 class DummyWriter:
     def __init__(self) -> None:
         self.written = []
+        self.player_id = None
 
     def write(self, data: bytes) -> None:
         self.written.append(data)
 
+    def writelines(self, chunks: list[bytes]) -> None:
+        self.written.append(b"".join(chunks))
+
     async def drain(self) -> None:  # pragma: no cover - trivial
         await asyncio.sleep(0)
 
@@ -23,30 +30,247 @@ class DummyWriter:
         pass
 
 
+class StalledWriter(DummyWriter):
+    """Writer whose peer never reads, so drain() never completes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.aborted = False
+
+    async def drain(self) -> None:
+        await asyncio.get_running_loop().create_future()
+
+    def abort(self) -> None:
+        self.aborted = True
+
+
 class ServerLogicTest(unittest.IsolatedAsyncioTestCase):
     async def test_bullet_deals_damage(self) -> None:
         server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
-        reader = asyncio.StreamReader()
         writer = DummyWriter()
-        target = PlayerState(reader=reader, writer=writer, name="Target", position=[0.0, 0.0, 0.0], rotation_y=0.0)
-        shooter = PlayerState(reader=reader, writer=writer, name="Shooter", position=[5.0, 0.0, 0.0], rotation_y=0.0)
+        target = PlayerState(id=1, writer=writer, name="Target", position=[0.0, 0.0, 0.0], rotation_y=0.0)
+        shooter = PlayerState(id=2, writer=writer, name="Shooter", position=[5.0, 0.0, 0.0], rotation_y=0.0)
         server.players = {
-            "target": target,
-            "shooter": shooter,
+            1: target,
+            2: shooter,
         }
         bullet = Bullet(
-            id="bullet",
-            owner_id="shooter",
+            id=1,
+            owner_id=2,
             position=[0.2, 0.0, 0.0],
             direction=[-1.0, 0.0, 0.0],
-            created_at=time(),
+            created_at=monotonic(),
         )
-        server.bullets = {"bullet": bullet}
+        server.bullets = {1: bullet}
 
-        await server._update_bullets(0.01)
+        server._update_bullets(0.01, monotonic())
         self.assertLess(target.health, 100)
-        self.assertNotIn("bullet", server.bullets)
-        self.assertTrue(writer.written)
+        self.assertEqual(target.snapshot["health"], target.health)
+        self.assertNotIn(1, server.bullets)
+        self.assertTrue(target.pending)
+        self.assertFalse(writer.written)
+
+        await server._flush_writes()
+        self.assertEqual(len(writer.written), 1)
+        self.assertFalse(target.pending)
+
+    async def test_stalled_client_does_not_block_flush(self) -> None:
+        server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
+        stalled, healthy = StalledWriter(), DummyWriter()
+        server._handle_message(stalled, {"type": "join", "name": "Stalled"})
+        server._handle_message(healthy, {"type": "join", "name": "Healthy"})
+        server._broadcast_state()
+
+        await asyncio.wait_for(server._flush_writes(), timeout=1.0)
+        self.assertTrue(stalled.aborted)
+        self.assertEqual(len(healthy.written), 2)
+
+    async def test_bullet_ignores_owner(self) -> None:
+        server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
+        writer = DummyWriter()
+        shooter = PlayerState(id=2, writer=writer, name="Shooter", position=[0.0, 0.0, 0.0], rotation_y=0.0)
+        server.players = {2: shooter}
+        bullet = Bullet(
+            id=1,
+            owner_id=2,
+            position=[0.1, 0.0, 0.0],
+            direction=[1.0, 0.0, 0.0],
+            created_at=monotonic(),
+        )
+        server.bullets = {1: bullet}
+
+        server._update_bullets(0.01, monotonic())
+        self.assertEqual(shooter.health, 100)
+        self.assertIn(1, server.bullets)
+        self.assertFalse(shooter.pending)
+
+    async def test_bullet_hits_with_spatial_grid(self) -> None:
+        server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
+        writer = DummyWriter()
+        target = PlayerState(id=1, writer=writer, name="Target", position=[10.0, 0.0, -3.0], rotation_y=0.0)
+        server.players = {1: target}
+        server.bullets = {
+            bullet_id: Bullet(
+                id=bullet_id,
+                owner_id=2,
+                position=[-50.0, 0.0, float(bullet_id)],
+                direction=[0.0, 0.0, 1.0],
+                created_at=monotonic(),
+            )
+            for bullet_id in range(1, BROADPHASE_THRESHOLD + 1)
+        }
+        server.bullets[100] = Bullet(
+            id=100,
+            owner_id=2,
+            position=[10.5, 0.0, -3.0],
+            direction=[0.0, 0.0, 1.0],
+            created_at=monotonic(),
+        )
+
+        server._update_bullets(0.01, monotonic())
+        self.assertEqual(target.health, 100 - BULLET_DAMAGE)
+        self.assertNotIn(100, server.bullets)
+        self.assertEqual(len(server.bullets), BROADPHASE_THRESHOLD)
+
+    async def test_discovery_response_tracks_player_count(self) -> None:
+        server = ShooterServer("127.0.0.1", 50000, "Test", max_players=4)
+        self.assertEqual(server._discovery_response, b"SERVER Test 50000 0 4\n")
+        conn = DummyWriter()
+
+        server._handle_message(conn, {"type": "join", "name": "Player"})
+        self.assertEqual(server._discovery_response, b"SERVER Test 50000 1 4\n")
+
+        server._handle_disconnect(conn)
+        self.assertEqual(server._discovery_response, b"SERVER Test 50000 0 4\n")
+
+    async def test_broadcast_sends_keyframe_then_deltas(self) -> None:
+        server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
+        mover_conn, idle_conn = DummyWriter(), DummyWriter()
+        server._handle_message(mover_conn, {"type": "join", "name": "Mover"})
+        server._handle_message(idle_conn, {"type": "join", "name": "Idle"})
+        mover = server.players[mover_conn.player_id]
+        idle = server.players[idle_conn.player_id]
+        idle_state = {"type": "state", "position": [5.0, 0.0, 0.0], "rotation_y": 0.0, "health": 100}
+        server._handle_message(idle_conn, idle_state)
+
+        server._broadcast_state()
+        self.assertEqual(_decode(b"".join(mover.pending))[-1]["type"], "world_state")
+        mover.pending.clear()
+        idle.pending.clear()
+
+        # Clients report their state every tick; an unchanged report is not news.
+        server._handle_message(idle_conn, idle_state)
+        server._broadcast_state()
+        self.assertFalse(mover.pending)
+
+        server._handle_message(idle_conn, idle_state)
+        server._handle_message(mover_conn, {**idle_state, "position": [1.0, 0.0, 0.0]})
+        server._broadcast_state()
+        delta = _decode(b"".join(idle.pending))[-1]
+        self.assertEqual(delta["type"], "world_delta")
+        self.assertEqual([player["id"] for player in delta["players"]], [mover.id])
+
+    async def test_malformed_state_fields_keep_previous_values(self) -> None:
+        server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
+        conn = DummyWriter()
+        server._handle_message(conn, {"type": "join", "name": "Player"})
+        player = server.players[conn.player_id]
+
+        server._handle_message(conn, {"type": "state", "rotation_y": None, "health": "abc", "position": "xyz"})
+        self.assertEqual(player.rotation_y, 0.0)
+        self.assertEqual(player.health, 100)
+        self.assertEqual(player.position, [0.0, RESPAWN_HEIGHT, 0.0])
+
+        server._handle_message(conn, {"type": "state", "rotation_y": 90, "health": 80.0})
+        self.assertEqual(player.rotation_y, 90.0)
+        self.assertEqual(player.health, 80)
+
+    async def test_large_finite_vectors_do_not_break_the_grid(self) -> None:
+        server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
+        conn = DummyWriter()
+        server._handle_message(conn, {"type": "join", "name": "Player"})
+        for _ in range(BROADPHASE_THRESHOLD + 8):
+            server._handle_message(conn, {"type": "shoot", "origin": [1.7e308, 0, 0], "direction": [1e308, 0, 0]})
+        self.assertFalse(server.bullets)
+
+        # Bullets that overflow anyway are expired before the grid buckets them.
+        server.bullets = {
+            bullet_id: Bullet(
+                id=bullet_id,
+                owner_id=conn.player_id,
+                position=[1.7e308, 0.0, 0.0],
+                direction=[1e308, 0.0, 0.0],
+                created_at=monotonic(),
+            )
+            for bullet_id in range(1, BROADPHASE_THRESHOLD + 8)
+        }
+        server._update_bullets(0.01, monotonic())
+        self.assertFalse(server.bullets)
+        server._broadcast_state()
+
+    async def test_shoot_normalises_direction_and_bounds_origin(self) -> None:
+        server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
+        conn = DummyWriter()
+        server._handle_message(conn, {"type": "join", "name": "Player"})
+
+        server._handle_message(conn, {"type": "shoot", "origin": [0, 1, 0], "direction": [0, 0, 0]})
+        server._handle_message(conn, {"type": "shoot", "origin": [1.7e308, 0, 0], "direction": [1, 0, 0]})
+        self.assertFalse(server.bullets)
+
+        server._handle_message(conn, {"type": "shoot", "origin": [0, 1, 0], "direction": [1e308, 0, 1e308]})
+        (bullet,) = server.bullets.values()
+        self.assertAlmostEqual(bullet.direction[0], 2**-0.5)
+        self.assertAlmostEqual(bullet.direction[2], 2**-0.5)
+
+    async def test_out_of_range_health_is_clamped(self) -> None:
+        server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
+        conn = DummyWriter()
+        server._handle_message(conn, {"type": "join", "name": "Player"})
+        player = server.players[conn.player_id]
+
+        server._handle_message(conn, {"type": "state", "health": 1e30})
+        self.assertEqual(player.health, 100)
+        server._handle_message(conn, {"type": "state", "health": -1e30})
+        self.assertEqual(player.health, 0)
+        # The world update must still encode.
+        server._broadcast_state()
+        self.assertEqual(_decode(b"".join(player.pending))[-1]["players"][0]["health"], 0)
+
+    async def test_non_finite_vectors_are_rejected(self) -> None:
+        server = ShooterServer("127.0.0.1", 0, "Test", max_players=4)
+        conn = DummyWriter()
+        server._handle_message(conn, {"type": "join", "name": "Player"})
+        player = server.players[conn.player_id]
+
+        server._handle_message(conn, {"type": "state", "position": ["nan", 0, 0], "rotation_y": "inf"})
+        self.assertEqual(player.position, [0.0, RESPAWN_HEIGHT, 0.0])
+        self.assertEqual(player.rotation_y, 0.0)
+        for _ in range(BROADPHASE_THRESHOLD + 1):
+            server._handle_message(conn, {"type": "shoot", "origin": [0, 0, "inf"], "direction": [1, 0, 0]})
+        self.assertFalse(server.bullets)
+
+        # Enough entities to take the spatial grid path, which cannot bucket NaN.
+        server.bullets = {
+            bullet_id: Bullet(
+                id=bullet_id,
+                owner_id=conn.player_id,
+                position=[50.0, 0.0, float(bullet_id)],
+                direction=[0.0, 0.0, 1.0],
+                created_at=monotonic(),
+            )
+            for bullet_id in range(1, BROADPHASE_THRESHOLD + 1)
+        }
+        server._update_bullets(0.01, monotonic())
+        self.assertEqual(len(server.bullets), BROADPHASE_THRESHOLD)
+
+
+def _decode(data: bytes) -> list[dict]:
+    messages = []
+    while data:
+        length = int.from_bytes(data[:4], "big")
+        messages.append(orjson.loads(data[4 : 4 + length]))
+        data = data[4 + length :]
+    return messages
 
 
 if __name__ == "__main__":  # pragma: no cover - manual execution